@@ -1,7 +1,8 @@
 import streamlit as st
 import json
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="Brandon Lang: NBA Edition", page_icon="🏀", layout="wide")
@@ -10,6 +11,21 @@ st.set_page_config(page_title="Brandon Lang: NBA Edition", page_icon="🏀", lay
 PICKS_FILE = "picks.json"
 HISTORY_FILE = "history.json"
 
+# --- RUN STATUS ---
+# A run that stops writing for this long has died, so the page stops polling
+STREAM_TIMEOUT = 10 * 60  # seconds
+
+def streaming_state(picks):
+    """Returns "live" while a run is writing picks, "stale" if it went quiet, else None."""
+    if not picks or picks.get("status") != "streaming":
+        return None
+    try:
+        updated_at = datetime.fromisoformat(picks["updated_at"].replace("Z", "+00:00"))
+    except Exception:
+        return "stale"
+    age = (datetime.now(timezone.utc) - updated_at).total_seconds()
+    return "live" if age < STREAM_TIMEOUT else "stale"
+
 # --- LOAD DATA ---
 def load_data():
     # Load Picks
@@ -67,6 +83,11 @@ with st.sidebar:
 if picks:
     st.title("🏀 Brandon Lang: NBA Edition")
     st.subheader(f"📅 Picks for {picks.get('date', 'Today')}")
+    run_state = streaming_state(picks)
+    if run_state == "live":
+        st.info("✍️ Brandon is still writing. Picks show up the moment they're made.")
+    elif run_state == "stale":
+        st.warning("⏸️ This run stopped updating partway through. These picks may be incomplete until the next run.")
     st.markdown("---")
 
     # THE HEADLINES (Big Bold Picks)
@@ -91,3 +112,10 @@ if picks:
 
 else:
     st.warning("⚠️ Data not found. The bot is likely running its morning update. Check back in 5 minutes!")
+
+# --- LIVE UPDATES ---
+# The pick workflows push each pick as it streams in (PUBLISH_EARLY_PICKS),
+# so while the run is still going, re-read the picks file every few seconds
+if streaming_state(picks) == "live":
+    time.sleep(3)
+    st.rerun()
@@ -4,11 +4,17 @@ import requests
 import pandas as pd
 import google.generativeai as genai
 import re
+import time
+from odds_stream import on_day
+from odds_scheduler import fetch_odds
+from slate import build_slate, diff_slate, format_line_moves, game_key, has_started, load_previous_picks, needs_full_run, started_picks, keep_started_picks, keep_previous_picks, explain_picks, save_picks, progress_saver
 from datetime import datetime, timezone, timedelta
 
 # --- CONFIGURATION ---
+PICKS_FILE = "picks.json"
 GEMINI_API_KEY = os.environ.get("GOOGLE_API_KEY")
 ODDS_API_KEY = os.environ.get("ODDS_API_KEY")
+ODDS_MARKETS = 'h2h,spreads,totals'
 
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
@@ -40,38 +46,25 @@ def get_live_odds():
     cst_now = datetime.now(timezone(timedelta(hours=-6)))
     today = cst_now.date()
     
-    url = 'https://api.the-odds-api.com/v4/sports/basketball_nba/odds'
-    params = {'apiKey': ODDS_API_KEY, 'regions': 'us', 'markets': 'h2h,spreads,totals', 'oddsFormat': 'american'}
+    params = {'apiKey': ODDS_API_KEY, 'regions': 'us', 'markets': ODDS_MARKETS, 'oddsFormat': 'american'}
     
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if not isinstance(data, list): return None, "Error fetching odds."
-
-        games = []
-        for g in data:
-            try:
-                # Convert Game Time to CST to match "Today"
-                game_time = datetime.fromisoformat(g['commence_time'].replace('Z', '+00:00'))
-                game_cst = game_time.astimezone(timezone(timedelta(hours=-6))).date()
-                
-                # Only keep games happening TODAY (CST)
-                if game_cst == today:
-                    games.append(g)
-            except: continue
+        # Only keep games happening TODAY (CST), decoded straight off the response stream
+        # (or reused if another run fetched them within the last few minutes)
+        games = fetch_odds("nba", params, ODDS_MARKETS.split(','), keep=on_day(cst_now.tzinfo, today))
         
         if not games: return None, f"No NBA games found for {today}."
-        
-        results = []
-        for g in games:
-            home, away = g['home_team'], g['away_team']
-            odds = json.dumps(g['bookmakers'][0]['markets']) if g['bookmakers'] else "No Odds"
-            results.append(f"MATCHUP: {away} @ {home}\nODDS: {odds}")
-            
-        return "\n\n".join(results), None
+        return games, None
     except Exception as e: return None, str(e)
 
+def format_odds(games):
+    results = []
+    for g in games:
+        home, away = g['home_team'], g['away_team']
+        odds = json.dumps(g['bookmakers'][0]['markets']) if g['bookmakers'] else "No Odds"
+        results.append(f"MATCHUP: {away} @ {home}\nODDS: {odds}")
+    return "\n\n".join(results)
+
 # --- 3. THE PARSER (Includes Win Probability) ---
 def extract_pick(section_text):
     if not section_text: return "See Analysis"
@@ -84,31 +77,95 @@ def extract_pick(section_text):
         return clean.replace("*", "").replace("`", "")
     return "See Analysis"
 
+# Section headers only count at the start of a line ("2. VALUE PLAY", "### 2. VALUE PLAY",
+# "**VALUE PLAY**"), so the phrase showing up inside the write-up doesn't split it
+LOCK_HEADER = re.compile(r"^[ \t#*]*(?:\d\.)?[ \t*]*LOCK OF THE DAY", re.MULTILINE)
+VALUE_HEADER = re.compile(r"^[ \t#*]*(?:\d\.)?[ \t*]*VALUE PLAY", re.MULTILINE)
+
+def split_sections(text):
+    """Returns the LOCK and VALUE sections, None for a header that hasn't appeared."""
+    lock_at, value_at = LOCK_HEADER.search(text), VALUE_HEADER.search(text)
+    lock_part = value_part = None
+    if value_at:
+        value_part = text[value_at.end():]
+    if lock_at:
+        lock_end = value_at.start() if value_at and value_at.start() > lock_at.start() else len(text)
+        lock_part = text[lock_at.end():lock_end]
+    return lock_part, value_part
+
 def parse_response(text):
     lock, value = "See Analysis", "See Analysis"
     try:
-        if "VALUE PLAY" in text:
-            parts = text.split("VALUE PLAY")
-            lock = extract_pick(parts[0]) if "LOCK OF THE DAY" in parts[0] else "See Analysis"
-            value = extract_pick(parts[1])
-        else:
-            lock = extract_pick(text) if "LOCK OF THE DAY" in text else "See Analysis"
+        lock_part, value_part = split_sections(text)
+        if lock_part is not None:
+            lock = extract_pick(lock_part)
+        if value_part is not None:
+            value = extract_pick(value_part)
     except Exception as e:
         print(f"Parsing Error: {e}")
     return lock, value
 
-# --- 4. THE BRAIN ---
-def generate_nba_content():
+# --- 4. STREAMING (Save Picks Before The Write-Up Is Done) ---
+PICK_LINE_DONE = re.compile(r"(?:Pick|Selection|Bet)\s*[:\-]\s*.+?(?:\s+Win Probability|\s+Confidence|\s+Analysis|\n)", re.IGNORECASE)
+
+def find_finished_picks(text):
+    """Returns the picks whose Pick line has fully streamed in so far."""
+    picks = {"lock": None, "value": None}
+    lock_part, value_part = split_sections(text)
+    if lock_part is not None and (value_part is not None or PICK_LINE_DONE.search(lock_part)):
+        picks["lock"] = extract_pick(lock_part)
+    if value_part is not None and PICK_LINE_DONE.search(value_part):
+        picks["value"] = extract_pick(value_part)
+    # "See Analysis" means no Pick line was found, that's not a pick to save or publish
+    return {slot: pick if pick != "See Analysis" else None for slot, pick in picks.items()}
+
+def stream_analysis(model, prompt, on_progress, every=2.0):
+    """Streams the write-up, reporting each pick as soon as it is readable."""
+    text, picks = "", {"lock": None, "value": None}
+    started = last_report = time.time()
+    for chunk in model.generate_content(prompt, stream=True):
+        text += chunk.text
+        new_pick = False
+        if not all(picks.values()):
+            for slot, pick in find_finished_picks(text).items():
+                if pick and not picks[slot]:
+                    picks[slot] = pick
+                    new_pick = True
+                    print(f"{slot.upper()} ready after {time.time() - started:.1f}s: {pick}")
+        if new_pick or time.time() - last_report >= every:
+            on_progress(text, picks)
+            last_report = time.time()
+    print(f"Analysis finished after {time.time() - started:.1f}s")
+    return text
+
+# --- 5. THE BRAIN ---
+def generate_nba_content(on_progress=None):
     # Use CST for the file date too
     cst_now = datetime.now(timezone(timedelta(hours=-6)))
     current_date = str(cst_now.date())
 
-    stats_text = get_nba_stats()
-    odds_text, error = get_live_odds()
+    now = datetime.now(timezone.utc)
+    previous = load_previous_picks(PICKS_FILE, current_date)
+
+    games, error = get_live_odds()
     
-    if error or not odds_text:
+    if error or not games:
+        # An empty or failed feed says nothing about the slate, so today's picks stand
+        if previous:
+            return keep_previous_picks(previous, f"odds fetch failed ({error}).", now)
         return {"date": current_date, "analysis": f"Error: {error}", "lock": "N/A", "value": "N/A"}
 
+    # Second run of the day: only re-analyze what changed since the last snapshot
+    slate = build_slate(games)
+    if previous:
+        changes = diff_slate(previous['slate'], slate, now)
+        if not needs_full_run(previous, changes):
+            return update_nba_content(previous, games, slate, changes, now)
+        print("A pick's game was scratched. Running a full analysis.")
+        # Games that already tipped off can't be picked anymore
+        games = [g for g in games if not has_started(g, now)]
+
+    stats_text = get_nba_stats()
     model = genai.GenerativeModel('gemini-2.5-flash')
     
     prompt = f"""
@@ -119,7 +176,7 @@ def generate_nba_content():
     {stats_text}
     
     --- TODAY'S ODDS ---
-    {odds_text}
+    {format_odds(games)}
     
     INSTRUCTIONS:
     1. Compare Net Ratings.
@@ -140,22 +197,112 @@ def generate_nba_content():
     Analysis: [Reasoning]
     """
     
+    def save_progress(text, picks):
+        if on_progress:
+            partial = {
+                "date": current_date,
+                "analysis": text,
+                "lock": picks["lock"] or "Pending",
+                "value": picks["value"] or "Pending",
+                "status": "streaming"
+            }
+            on_progress(keep_started_picks(previous, partial, now) if previous else partial)
+
     try:
-        analysis = model.generate_content(prompt).text
+        analysis = stream_analysis(model, prompt, save_progress)
         lock, value = parse_response(analysis)
 
-        return {
+        result = {
             "date": current_date,
             "analysis": analysis,
             "lock": lock,
-            "value": value
+            "value": value,
+            "slate": slate,
+            "pick_notes": {"lock": "New: full slate analysis.", "value": "New: full slate analysis."},
+            "status": "final"
         }
+        # A pick whose game has tipped off is in play, the full run can't replace it
+        return keep_started_picks(previous, result, now) if previous else result
     except Exception as e:
+        if previous:
+            return keep_previous_picks(previous, f"full re-analysis failed ({e}).", now)
         return {"date": current_date, "analysis": f"AI Error: {e}", "lock": "Error", "value": "Error"}
 
+# --- 6. THE UPDATE (Second Run Of The Day) ---
+def update_nba_content(previous, games, slate, changes, now):
+    changed = set(changes['new'] + changes['moved'])
+    started = started_picks(previous, now)
+    result = dict(previous, slate=slate, slate_changes=changes)
+
+    # Nothing new to look at: reuse the earlier picks as they are
+    if not changed or len(started) == 2:
+        print("No new games or line moves to re-analyze. Keeping earlier picks.")
+        result["pick_notes"] = explain_picks(previous, previous['lock'], previous['value'], changes, reanalyzed=False, started=started)
+        return result
+
+    print(f"Re-analyzing {len(changed)} changed games...")
+    stats_text = get_nba_stats()
+    model = genai.GenerativeModel('gemini-2.5-flash')
+
+    prompt = f"""
+    You are Brandon Lang. You already posted today's picks:
+    LOCK OF THE DAY: {previous['lock']}
+    VALUE PLAY: {previous['value']}
+
+    Since then, the slate changed. Only these games are new or had their lines move:
+
+    Data:
+    --- TEAM NET RATINGS (2026 Season) ---
+    {stats_text}
+
+    --- LINE MOVES (earlier -> now) ---
+    {format_line_moves(previous['slate'], slate, changes['moved']) or "None"}
+
+    --- CHANGED GAMES ODDS ---
+    {format_odds([g for g in games if game_key(g) in changed])}
+
+    INSTRUCTIONS:
+    1. Decide if any changed game beats your earlier LOCK or VALUE PLAY, or if a line move killed the edge.
+    2. If your earlier pick still holds, or its game has already tipped off, repeat it EXACTLY as written above.
+    3. WIN PROBABILITY: You MUST calculate a percentage chance of winning based on the Net Rating gap.
+
+    STRICT OUTPUT FORMAT:
+    1. LOCK OF THE DAY
+    Pick: [Team Name] [Spread/Moneyline]
+    Win Probability: [XX.X]%
+    Confidence: [High/Medium]
+    Analysis: [Reasoning]
+
+    2. VALUE PLAY
+    Pick: [Team Name] [Spread/Moneyline]
+    Win Probability: [XX.X]%
+    Analysis: [Reasoning]
+    """
+
+    try:
+        update = model.generate_content(prompt).text
+        lock, value = parse_response(update)
+    except Exception as e:
+        # Keep the earlier picks rather than overwrite them with an error
+        print(f"AI Error during update: {e}")
+        result["pick_notes"] = {slot: f"Kept: re-analysis failed ({e})." for slot in ("lock", "value")}
+        return result
+
+    # A pick we could not parse, or whose game has tipped off, keeps the earlier one
+    if lock == "See Analysis" or "lock" in started: lock = previous['lock']
+    if value == "See Analysis" or "value" in started: value = previous['value']
+
+    result.update({
+        "analysis": previous['analysis'] + "\n\n---\n\n### SLATE UPDATE\n\n" + update,
+        "lock": lock,
+        "value": value,
+        "pick_notes": explain_picks(previous, lock, value, changes, started=started)
+    })
+    return result
+
 if __name__ == "__main__":
     print("Starting Analysis...")
-    data = generate_nba_content()
-    with open("picks.json", "w") as f:
-        json.dump(data, f, indent=4)
+    # Picks land on disk (and get pushed) as soon as they stream in, then again once the write-up is done
+    data = generate_nba_content(on_progress=progress_saver(PICKS_FILE))
+    save_picks(PICKS_FILE, data)
     print("Success! Picks saved.")
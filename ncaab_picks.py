@@ -1,30 +1,36 @@
 import os
-import requests
 import json
+import re
+import time
 import google.generativeai as genai
-from datetime import datetime
+from odds_stream import on_day
+from odds_scheduler import fetch_odds
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo  # <--- NEW: Import Timezone support
+from slate import build_slate, diff_slate, format_line_moves, game_key, has_started, load_previous_picks, needs_full_run, started_picks, keep_started_picks, keep_previous_picks, explain_picks, save_picks, progress_saver
 
 # --- CONFIGURATION ---
 ODDS_API_KEY = os.environ.get("ODDS_API_KEY")
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
+PICKS_FILE = "ncaab_picks.json"
+MAX_GAMES = 25
 
 # Configure Gemini
 genai.configure(api_key=GOOGLE_API_KEY)
 
 def get_ncaab_odds():
-    """Fetches upcoming NCAAB odds from The Odds API."""
-    url = f"https://api.the-odds-api.com/v4/sports/basketball_ncaab/odds/?regions=us&markets=spreads&oddsFormat=american&apiKey={ODDS_API_KEY}"
+    """Fetches today's NCAAB odds from The Odds API, streaming the payload."""
+    params = {'apiKey': ODDS_API_KEY, 'regions': 'us', 'markets': 'spreads', 'oddsFormat': 'american'}
+    eastern = ZoneInfo("America/New_York")
     try:
         print(f"📡 Connecting to Odds API...")
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        # Drop games outside today (ET) as they are read and stop once we have enough
+        data = fetch_odds("ncaab", params, ['spreads'], keep=on_day(eastern, datetime.now(eastern).date()), limit=MAX_GAMES)
         print(f"✅ Odds Fetched: {len(data)} games found.")
-        return data
+        return data, None
     except Exception as e:
         print(f"❌ Error fetching odds: {e}")
-        return []
+        return [], str(e)
 
 def format_games_with_context(games_data):
     """
@@ -33,7 +39,7 @@ def format_games_with_context(games_data):
     game_lines = []
     
     # Process top 25 games to give us a good selection
-    for game in games_data[:25]: 
+    for game in games_data[:MAX_GAMES]: 
         home = game.get('home_team')
         away = game.get('away_team')
         
@@ -58,12 +64,62 @@ def format_games_with_context(games_data):
 
     return "\n".join(game_lines)
 
-def generate_picks(formatted_games_text):
-    """Sends Clean Lines + Stat Instructions to Gemini."""
-    
+def get_today():
     # --- TIMEZONE FIX ---
     # Force the date to be US Eastern Time, not UTC
-    today = datetime.now(ZoneInfo("America/New_York")).strftime("%Y-%m-%d")
+    return datetime.now(ZoneInfo("America/New_York")).strftime("%Y-%m-%d")
+
+def parse_json_response(text):
+    """Strips Markdown fences from a Gemini reply and loads the JSON."""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text.replace("```json", "").replace("```", "")
+    elif text.startswith("```"):
+        text = text.replace("```", "")
+    return json.loads(text)
+
+def read_json_field(text, field):
+    """Pulls a finished string field out of a JSON reply that is still streaming."""
+    match = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % field, text)
+    if not match:
+        return None
+    try:
+        return json.loads(f'"{match.group(1)}"', strict=False)
+    except ValueError:
+        return match.group(1)
+
+def read_partial_analysis(text):
+    """Returns however much of the analysis has streamed in so far."""
+    finished = read_json_field(text, "analysis")
+    if finished is not None:
+        return finished
+    start = re.search(r'"analysis"\s*:\s*"', text)
+    if not start:
+        return ""
+    return text[start.end():].replace('\\n', '\n').replace('\\"', '"')
+
+def stream_picks(model, prompt, on_progress, every=2.0):
+    """Streams Gemini's reply, reporting each pick the moment its field closes."""
+    text, picks = "", {"lock": None, "value": None}
+    started = last_report = time.time()
+    for chunk in model.generate_content(prompt, stream=True):
+        text += chunk.text
+        new_pick = False
+        for slot in picks:
+            if not picks[slot]:
+                picks[slot] = read_json_field(text, slot)
+                if picks[slot]:
+                    new_pick = True
+                    print(f"🎯 {slot.upper()} ready after {time.time() - started:.1f}s: {picks[slot]}")
+        if new_pick or time.time() - last_report >= every:
+            on_progress(picks, read_partial_analysis(text))
+            last_report = time.time()
+    print(f"📝 Analysis finished after {time.time() - started:.1f}s")
+    return text
+
+def generate_picks(formatted_games_text, on_progress=None):
+    """Sends Clean Lines + Stat Instructions to Gemini."""
+    today = get_today()
 
     if not formatted_games_text:
         return {
@@ -98,18 +154,23 @@ def generate_picks(formatted_games_text):
     }}
     """
 
+    def save_progress(picks, analysis):
+        if on_progress:
+            on_progress({
+                "date": today,
+                "lock": picks["lock"] or "Pending",
+                "value": picks["value"] or "Pending",
+                "analysis": analysis,
+                "status": "streaming"
+            })
+
     try:
         print("🧠 Sending matchups to Gemini 2.5...")
         model = genai.GenerativeModel("gemini-2.5-flash") 
-        response = model.generate_content(prompt)
-        
-        text = response.text.strip()
-        if text.startswith("```json"):
-            text = text.replace("```json", "").replace("```", "")
-        elif text.startswith("```"):
-            text = text.replace("```", "")
-            
-        return json.loads(text)
+        text = stream_picks(model, prompt, save_progress)
+        picks = parse_json_response(text)
+        picks["status"] = "final"
+        return picks
     except Exception as e:
         print(f"❌ Error generating picks: {e}")
         return {
@@ -119,11 +180,76 @@ def generate_picks(formatted_games_text):
             "analysis": f"AI Error: {e}"
         }
 
+def update_picks(previous, games_data, slate, changes, now):
+    """Second run of the day: re-checks only the games that changed."""
+    changed = set(changes['new'] + changes['moved'])
+    changed_text = format_games_with_context([g for g in games_data if game_key(g) in changed])
+    started = started_picks(previous, now)
+    result = dict(previous, slate=slate, slate_changes=changes)
+
+    # Nothing new with a line on it (or both picks in play): reuse the earlier picks as they are
+    if not changed_text or len(started) == 2:
+        print("♻️ No new games or line moves to re-analyze. Keeping earlier picks.")
+        result["pick_notes"] = explain_picks(previous, previous['lock'], previous['value'], changes, reanalyzed=False, started=started)
+        return result
+
+    prompt = f"""
+    You are a sharp Vegas sports bettor named 'Brandon Lang'.
+    Today is {previous['date']}.
+
+    You already posted today's picks:
+    LOCK: {previous['lock']}
+    VALUE: {previous['value']}
+
+    Since then, these games are new or had their lines move (earlier -> now):
+    {format_line_moves(previous['slate'], slate, changes['moved']) or "No line moves."}
+
+    Here are the OFFICIAL current lines for ONLY the changed games:
+    {changed_text}
+
+    YOUR MISSION:
+    1.  Decide if any changed game beats your earlier LOCK or VALUE, or if a line move killed the edge.
+    2.  If an earlier pick still holds, or its game has already tipped off, repeat it EXACTLY as written above.
+
+    CRITICAL RULES:
+    -   You MUST select the spread exactly as written in the list above.
+    -   Do NOT invent lines.
+
+    OUTPUT JSON ONLY:
+    {{
+        "lock": "Team Name (Spread)",
+        "value": "Team Name (Spread)",
+        "analysis": "Why you kept or changed each pick..."
+    }}
+    """
+
+    try:
+        print(f"🧠 Re-analyzing {len(changed)} changed games with Gemini 2.5...")
+        model = genai.GenerativeModel("gemini-2.5-flash")
+        update = parse_json_response(model.generate_content(prompt).text)
+    except Exception as e:
+        # Keep the earlier picks rather than overwrite them with an error
+        print(f"❌ Error updating picks: {e}")
+        result["pick_notes"] = {slot: f"Kept: re-analysis failed ({e})." for slot in ("lock", "value")}
+        return result
+
+    # A missing pick, or one whose game has tipped off, keeps the earlier one
+    lock = previous['lock'] if "lock" in started else update.get("lock") or previous['lock']
+    value = previous['value'] if "value" in started else update.get("value") or previous['value']
+    result.update({
+        "analysis": f"{previous['analysis']}\n\nSLATE UPDATE: {update.get('analysis', '')}",
+        "lock": lock,
+        "value": value,
+        "pick_notes": explain_picks(previous, lock, value, changes, started=started)
+    })
+    return result
+
 if __name__ == "__main__":
     print("🚀 Starting NCAAB Pick Generator...")
     
     # 1. Get Odds
-    raw_odds = get_ncaab_odds()
+    raw_odds, odds_error = get_ncaab_odds()
+    slate = build_slate(raw_odds[:MAX_GAMES])
     
     # 2. Format
     clean_lines = format_games_with_context(raw_odds)
@@ -131,12 +257,38 @@ if __name__ == "__main__":
     print(clean_lines)
     print("---------------------------")
 
-    # 3. Generate Picks
-    picks = generate_picks(clean_lines)
+    # 3. Generate Picks (or only re-check what changed since the last run today)
+    now = datetime.now(timezone.utc)
+    previous = load_previous_picks(PICKS_FILE, get_today())
+    changes = diff_slate(previous['slate'], slate, now) if previous else None
+    if previous and not raw_odds:
+        # An empty or failed feed says nothing about the slate, so today's picks stand
+        print("⚠️ No odds this run. Keeping the earlier picks.")
+        picks = keep_previous_picks(previous, f"odds fetch failed ({odds_error or 'no games returned'}).", now)
+    elif previous and not needs_full_run(previous, changes):
+        picks = update_picks(previous, raw_odds[:MAX_GAMES], slate, changes, now)
+    else:
+        # A pick whose game has tipped off is in play, the full run can't replace it
+        save_progress = progress_saver(PICKS_FILE, adjust=lambda partial: keep_started_picks(previous, partial, now) if previous else partial)
+
+        if previous:
+            print("🔁 A pick's game was scratched. Running a full analysis.")
+            # Games that already tipped off can't be picked anymore
+            clean_lines = format_games_with_context([g for g in raw_odds if not has_started(g, now)])
+
+        # Picks land on disk (and get pushed) as soon as they stream in, then again once the write-up is done
+        picks = generate_picks(clean_lines, on_progress=save_progress)
+        if previous and picks.get("lock") in ("Error", "No Games Found"):
+            # A failed full run must not wipe picks that are already in play
+            reason = "no games left to re-analyze." if picks.get("lock") == "No Games Found" else f"full re-analysis failed ({picks.get('analysis')})."
+            picks = keep_previous_picks(previous, reason, now)
+        elif picks.get("lock") not in ("Error", "No Games Found"):
+            picks["slate"] = slate
+            picks["pick_notes"] = {"lock": "New: full slate analysis.", "value": "New: full slate analysis."}
+            if previous:
+                keep_started_picks(previous, picks, now)
     
     # 4. Save
-    output_file = "ncaab_picks.json"
-    with open(output_file, "w") as f:
-        json.dump(picks, f, indent=4)
+    save_picks(PICKS_FILE, picks)
     
-    print(f"✅ Picks saved to {output_file}")
+    print(f"✅ Picks saved to {PICKS_FILE}")
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import json
 import os
+import time
+from datetime import datetime, timezone
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -10,6 +12,21 @@ st.set_page_config(
     layout="wide"
 )
 
+# --- RUN STATUS ---
+# A run that stops writing for this long has died, so the page stops polling
+STREAM_TIMEOUT = 10 * 60  # seconds
+
+def streaming_state(picks):
+    """Returns "live" while a run is writing picks, "stale" if it went quiet, else None."""
+    if not picks or picks.get("status") != "streaming":
+        return None
+    try:
+        updated_at = datetime.fromisoformat(picks["updated_at"].replace("Z", "+00:00"))
+    except Exception:
+        return "stale"
+    age = (datetime.now(timezone.utc) - updated_at).total_seconds()
+    return "live" if age < STREAM_TIMEOUT else "stale"
+
 # --- LOAD DATA ---
 def load_data():
     # 1. Load Picks (or create dummy if missing)
@@ -73,6 +90,11 @@ st.sidebar.caption(f"Last Updated: {picks_data.get('date', 'Unknown')}")
 # --- MAIN PAGE UI ---
 st.title("🏀 NCAAB AI Betting Agent")
 st.subheader(f"📅 **Picks for {picks_data.get('date', 'Today')}**")
+run_state = streaming_state(picks_data)
+if run_state == "live":
+    st.info("✍️ Brandon is still writing. Picks show up the moment they're made.")
+elif run_state == "stale":
+    st.warning("⏸️ This run stopped updating partway through. These picks may be incomplete until the next run.")
 
 st.markdown("---")
 
@@ -94,3 +116,10 @@ st.markdown("---")
 # Analysis Section
 st.subheader("📝 **The Breakdown**")
 st.write(picks_data.get("analysis", "Analysis pending..."))
+
+# --- LIVE UPDATES ---
+# The pick workflows push each pick as it streams in (PUBLISH_EARLY_PICKS),
+# so while the run is still going, re-read the picks file every few seconds
+if streaming_state(picks_data) == "live":
+    time.sleep(3)
+    st.rerun()
@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import requests
+from datetime import datetime, timezone, timedelta, time
+from zoneinfo import ZoneInfo
+from odds_stream import stream_games
+from slate import BAD_PICKS, pick_game
+
+# --- CONFIGURATION ---
+ODDS_API_KEY = os.environ.get("ODDS_API_KEY")
+API_URL = "https://api.the-odds-api.com/v4"
+STATE_FILE = "odds_schedule_{sport}.json"  # One per sport, so NBA and NCAAB jobs never touch the same file
+
+# Request cost per call: odds cost one per market (one region), scores with daysFrom cost two
+SCORES_COST = 2
+SPORTS = {
+    "nba": {
+        "key": "basketball_nba",
+        "tz": timezone(timedelta(hours=-6)),  # Same fixed CST as daily.picks.py
+        "picks": "picks.json",
+        "history": "history.json",
+        "odds_cost": 3
+    },
+    "ncaab": {
+        "key": "basketball_ncaab",
+        "tz": ZoneInfo("America/New_York"),  # Same ET date as ncaab_picks.py
+        "picks": "ncaab_picks.json",
+        "history": "ncaab_history.json",
+        "odds_cost": 1
+    },
+}
+
+# Freshness targets
+PICK_LEAD = timedelta(hours=3)         # First odds pull of the day, this long before first tip
+CLOSE_LEAD = timedelta(minutes=45)     # One closing-line refresh this close to first tip
+ODDS_FRESHNESS = timedelta(minutes=45) # Odds younger than this are shared, not re-fetched
+GAME_LENGTH = timedelta(hours=3)       # Tip-off to final, with a margin for overtime
+FALLBACK_FINAL = time(2, 0)            # No tip times on file: grade after this local time the next day
+
+# --- 1. SHARED STATE ---
+# Each sport's workflows commit that sport's state file, so a job sees the
+# earlier jobs' fetches and the last quota the API reported to them.
+def load_state(sport):
+    path = STATE_FILE.format(sport=sport)
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+def save_state(sport, state):
+    with open(STATE_FILE.format(sport=sport), "w") as f:
+        json.dump(state, f, indent=4)
+
+def read_json(path):
+    if not os.path.exists(path): return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def format_time(value):
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+# --- 2. QUOTA ---
+def record_quota(state, headers):
+    """Stores the quota headers the Odds API sends back on every paid call."""
+    remaining = headers.get("x-requests-remaining")
+    if remaining is None: return
+    state["quota"] = {
+        "remaining": int(float(remaining)),
+        "used": int(float(headers.get("x-requests-used", 0))),
+        "last_cost": int(float(headers.get("x-requests-last", 0))),
+        "checked_at": format_time(datetime.now(timezone.utc))
+    }
+
+def days_left_in_month(now):
+    next_month = (now.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return (next_month.date() - now.date()).days
+
+def latest_quota(now):
+    """The most recent quota any sport saw this month (the quota is account-wide).
+
+    Returns None when we don't know it (nothing fetched yet this month).
+    """
+    quotas = [load_state(sport).get("quota") for sport in SPORTS]
+    quotas = [q for q in quotas if q]
+    if not quotas: return None
+    quota = max(quotas, key=lambda q: q["checked_at"])
+    checked_at = parse_time(quota["checked_at"])
+    if (checked_at.year, checked_at.month) != (now.year, now.month):
+        return None  # The quota has reset since we last looked
+    return quota
+
+def spare_quota(quota, now):
+    """Requests left after reserving one odds and one scores pull per sport per day."""
+    daily_need = sum(cfg["odds_cost"] + SCORES_COST for cfg in SPORTS.values())
+    return quota["remaining"] - days_left_in_month(now) * daily_need
+
+def can_afford(now, cost, essential):
+    """Essential calls just need the requests to exist; extras must leave the reserve alone."""
+    quota = latest_quota(now)
+    if quota is None:
+        return True
+    if essential:
+        return quota["remaining"] >= cost
+    return spare_quota(quota, now) >= cost
+
+# --- 3. TODAY'S SCHEDULE ---
+def get_tip_times(sport, now):
+    """Today's commence times from the events endpoint (free, no quota cost)."""
+    cfg = SPORTS[sport]
+    start = datetime.combine(now.astimezone(cfg["tz"]).date(), datetime.min.time(), tzinfo=cfg["tz"])
+    params = {
+        'apiKey': ODDS_API_KEY,
+        'commenceTimeFrom': format_time(start),
+        'commenceTimeTo': format_time(start + timedelta(days=1))
+    }
+    response = requests.get(f"{API_URL}/sports/{cfg['key']}/events", params=params, timeout=30)
+    response.raise_for_status()
+    return sorted(parse_time(event['commence_time']) for event in response.json())
+
+def games_final_at(picks):
+    """When the games our picks are on should all be final (None if unknown)."""
+    slate = (picks or {}).get("slate")
+    if not slate: return None
+    keys = [pick_game(picks.get(slot), slate) for slot in ("lock", "value")]
+    keys = [key for key in keys if key] or list(slate)
+    tips = [parse_time(slate[key]["commence_time"]) for key in keys if slate[key].get("commence_time")]
+    return max(tips) + GAME_LENGTH if tips else None
+
+def grading_time(sport, picks):
+    """When the picks can be graded: their games' final, or a safe hour the next morning."""
+    final_at = games_final_at(picks)
+    if final_at: return final_at
+    try:
+        day = datetime.strptime(picks["date"], "%Y-%m-%d").date() + timedelta(days=1)
+    except Exception:
+        return None
+    return datetime.combine(day, FALLBACK_FINAL, tzinfo=SPORTS[sport]["tz"])
+
+# --- 4. THE PLANNER ---
+def plan_odds(sport, state, now):
+    try:
+        tips = get_tip_times(sport, now)
+    except Exception as e:
+        return True, f"No schedule available ({e}), fetching anyway."
+    if not tips:
+        return False, "No games today."
+
+    first, last = tips[0], tips[-1]
+    if now >= last:
+        return False, "Every game has tipped off."
+
+    today = str(now.astimezone(SPORTS[sport]["tz"]).date())
+    cache = state.get("odds", {})
+    fetched_at = parse_time(cache["fetched_at"]) if cache.get("date") == today else None
+    cost = SPORTS[sport]["odds_cost"]
+
+    if fetched_at and now - fetched_at < ODDS_FRESHNESS:
+        return False, "Odds are still fresh."
+    if fetched_at is None:
+        if now < first - PICK_LEAD:
+            return False, f"Too early: first tip at {format_time(first)}."
+        if not can_afford(now, cost, essential=True):
+            return False, "Out of quota."
+        return True, "First odds of the day ahead of first tip."
+    # Already have today's odds: one refresh close to first tip, if the quota can spare it
+    if first - CLOSE_LEAD <= now < first and fetched_at < first - CLOSE_LEAD:
+        if not can_afford(now, cost, essential=False):
+            return False, "Saving quota: skipping the closing-line refresh."
+        return True, "Closing-line refresh before first tip."
+    return False, "Today's odds already fetched."
+
+def plan_scores(sport, state, now):
+    cfg = SPORTS[sport]
+    picks = read_json(cfg["picks"])
+    history = read_json(cfg["history"]) or {}
+    if not picks:
+        return False, "No picks to grade."
+    if all(picks.get(slot) in BAD_PICKS for slot in ("lock", "value")):
+        return False, f"Nothing to grade for {picks.get('date')} ({picks.get('lock')})."
+    if history.get("updated_date") == picks.get("date"):
+        return False, f"Already graded {picks.get('date')}."
+
+    final_at = grading_time(sport, picks)
+    if final_at is None:
+        return False, "Picks have no date to grade against."
+    if now < final_at:
+        return False, f"Pick games not final until {format_time(final_at)}."
+    if shared_scores(state, final_at) is not None:
+        return True, "Grading with scores another job already fetched."
+    if not can_afford(now, SCORES_COST, essential=True):
+        return False, "Out of quota."
+    return True, "Pick games should be final."
+
+def plan(sport, job, state, now):
+    if job == "odds":
+        return plan_odds(sport, state, now)
+    if job == "scores":
+        return plan_scores(sport, state, now)
+    raise ValueError(f"Unknown job: {job}")
+
+# --- 5. SHARED FETCHES ---
+def fetch_odds(sport, params, markets, keep=None, limit=None):
+    """Today's compact odds, shared between runs that land close together."""
+    state = load_state(sport)
+    now = datetime.now(timezone.utc)
+    today = str(now.astimezone(SPORTS[sport]["tz"]).date())
+
+    cache = state.get("odds", {})
+    if cache.get("date") == today and now - parse_time(cache["fetched_at"]) < ODDS_FRESHNESS:
+        print(f"♻️ Reusing {sport.upper()} odds fetched at {cache['fetched_at']}.")
+        return cache["games"]
+
+    url = f"{API_URL}/sports/{SPORTS[sport]['key']}/odds"
+    try:
+        games = stream_games(url, params, markets, keep=keep, limit=limit, on_headers=lambda headers: record_quota(state, headers))
+        state["odds"] = {"date": today, "fetched_at": format_time(now), "games": games}
+    finally:
+        # A failed call can still have cost requests, so the quota is kept either way
+        save_state(sport, state)
+    return games
+
+def shared_scores(state, final_at):
+    """Scores already fetched after the pick games went final, if any."""
+    cache = state.get("scores")
+    if not cache or not cache.get("games") or final_at is None: return None
+    if parse_time(cache["fetched_at"]) < final_at: return None
+    return cache["games"]
+
+def fetch_scores(sport, days_from=3):
+    """Completed games for grading, fetched at most once per slate across jobs.
+
+    Raises on an API error, so the graders never mark a day graded without scores.
+    """
+    state = load_state(sport)
+    final_at = grading_time(sport, read_json(SPORTS[sport]["picks"]) or {})
+    cached = shared_scores(state, final_at)
+    if cached is not None:
+        print(f"♻️ Reusing {sport.upper()} scores fetched at {state['scores']['fetched_at']}.")
+        return cached
+
+    url = f"{API_URL}/sports/{SPORTS[sport]['key']}/scores/"
+    response = requests.get(url, params={'apiKey': ODDS_API_KEY, 'daysFrom': days_from}, timeout=30)
+    record_quota(state, response.headers)
+    save_state(sport, state)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a list of scores, got: {str(data)[:200]}")
+
+    # Graders only look at finished games, so that's all we keep
+    games = [
+        {key: g.get(key) for key in ("home_team", "away_team", "commence_time", "completed", "scores")}
+        for g in data if g.get("completed")
+    ]
+    # Nothing finished yet is not worth sharing with the next job
+    if games:
+        state["scores"] = {"fetched_at": format_time(datetime.now(timezone.utc)), "games": games}
+        save_state(sport, state)
+    return games
+
+# --- EXECUTION ---
+# Usage: python odds_scheduler.py <sport> <job> [<job> ...]
+# Prints "<job>=true|false" per job (for $GITHUB_OUTPUT) and the reasons to stderr.
+if __name__ == "__main__":
+    sport, jobs = sys.argv[1], sys.argv[2:]
+    state = load_state(sport)
+    now = datetime.now(timezone.utc)
+    for job in jobs:
+        run, reason = plan(sport, job, state, now)
+        print(f"{job}={'true' if run else 'false'}")
+        print(f"📅 {sport.upper()} {job}: {reason}", file=sys.stderr)
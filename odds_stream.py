@@ -0,0 +1,86 @@
+import codecs
+import json
+import requests
+from datetime import datetime
+
+# --- STREAMING ODDS INGESTION ---
+# The Odds API sends one big JSON array of games. Instead of response.json() on
+# the whole payload, games are decoded one at a time off the response stream,
+# filtered, and shrunk to the book and markets we use before the next is read.
+# Memory then grows with the games we keep, not with the raw payload size.
+
+CHUNK_SIZE = 64 * 1024
+_decoder = json.JSONDecoder()
+
+def iter_json_array(chunks):
+    """Yields the items of a top-level JSON array as their bytes arrive."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, started = "", 0, False
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+        while True:
+            # Skip whitespace and the commas between items
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer): break
+
+            if not started:
+                # Errors come back as a JSON object instead of a list
+                if buffer[pos] != "[":
+                    raise ValueError(f"Expected a list of games, got: {buffer[pos:pos + 200]}")
+                started = True
+                pos += 1
+                continue
+
+            if buffer[pos] == "]": return
+
+            try:
+                item, pos = _decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # Item not fully downloaded yet, read another chunk
+            yield item
+
+    raise ValueError("Odds payload ended before the list closed.")
+
+def on_day(tz, day):
+    """Keeps games that tip off on `day` in the given timezone."""
+    def keep(game):
+        try:
+            game_time = datetime.fromisoformat(game['commence_time'].replace('Z', '+00:00'))
+            return game_time.astimezone(tz).date() == day
+        except Exception:
+            return False
+    return keep
+
+def compact_game(game, markets, bookmakers=None):
+    """Keeps only the first usable bookmaker and the markets we format."""
+    record = {
+        "id": game.get('id'),
+        "commence_time": game.get('commence_time'),
+        "home_team": game.get('home_team'),
+        "away_team": game.get('away_team'),
+        "bookmakers": []
+    }
+    for book in game.get('bookmakers', []):
+        if bookmakers and book.get('key') not in bookmakers: continue
+        kept = [{"key": m['key'], "outcomes": m.get('outcomes', [])} for m in book.get('markets', []) if m.get('key') in markets]
+        if kept:
+            record["bookmakers"] = [{"key": book.get('key'), "markets": kept}]
+            break
+    return record
+
+def stream_games(url, params, markets, keep=None, limit=None, bookmakers=None, on_headers=None):
+    """Fetches odds and returns compact games, reading only as far as needed."""
+    games = []
+    with requests.get(url, params=params, stream=True, timeout=30) as response:
+        if on_headers:
+            on_headers(response.headers)
+        response.raise_for_status()
+        for game in iter_json_array(response.iter_content(CHUNK_SIZE)):
+            if keep and not keep(game): continue
+            games.append(compact_game(game, markets, bookmakers))
+            # Stop downloading once we have all the games we will use
+            if limit and len(games) >= limit: break
+    return games
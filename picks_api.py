@@ -0,0 +1,209 @@
+import os
+import json
+import gzip
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- CONFIGURATION ---
+HOST = os.environ.get("PICKS_API_HOST", "0.0.0.0")
+PORT = int(os.environ.get("PICKS_API_PORT", "8000"))
+
+SPORTS = {
+    "nba": {"picks": "picks.json", "history": "history.json"},
+    "ncaab": {"picks": "ncaab_picks.json", "history": "ncaab_history.json"},
+}
+
+# How often (seconds) to stat the files on disk. Between checks every request
+# is answered straight from memory.
+CHECK_INTERVAL = 1.0
+
+EMPTY_HISTORY = {
+    "lock": {"wins": 0, "losses": 0, "pushes": 0},
+    "value": {"wins": 0, "losses": 0, "pushes": 0},
+    "updated_date": ""
+}
+
+# --- 1. READ THE STORE ---
+def read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def calculate_win_pct(record):
+    total = record.get('wins', 0) + record.get('losses', 0)  # Pushes don't count towards %
+    if total == 0:
+        return 0.0
+    return round(record['wins'] / total * 100, 1)
+
+def build_record(history):
+    return {
+        slot: dict(history.get(slot, EMPTY_HISTORY[slot]), win_pct=calculate_win_pct(history.get(slot, {})))
+        for slot in ("lock", "value")
+    }
+
+def build_payloads():
+    """Every route's JSON body, built from the files as they are right now."""
+    payloads = {"/": {"sports": sorted(SPORTS), "routes": ["/<sport>", "/<sport>/picks", "/<sport>/record", "/<sport>/history"]}}
+    for sport, files in SPORTS.items():
+        picks = read_json(files["picks"], None)
+        history = read_json(files["history"], EMPTY_HISTORY)
+        record = build_record(history)
+
+        payloads[f"/{sport}"] = {"sport": sport, "picks": picks, "record": record}
+        payloads[f"/{sport}/picks"] = picks
+        payloads[f"/{sport}/record"] = record
+        payloads[f"/{sport}/history"] = history
+    return payloads
+
+def store_signature():
+    """Changes whenever any underlying file is written, replaced or removed."""
+    signature = []
+    for files in SPORTS.values():
+        for path in files.values():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+    return tuple(signature)
+
+# --- 2. THE SNAPSHOT ---
+class Snapshot:
+    """Pre-encoded responses for every route, rebuilt only when the store changes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.signature = None
+        self.checked_at = 0.0
+        self.responses = {}
+
+    def get(self, path):
+        self.refresh()
+        return self.responses.get(path)
+
+    def refresh(self):
+        if time.monotonic() - self.checked_at < CHECK_INTERVAL:
+            return
+        with self.lock:
+            # Another thread may have refreshed while we waited
+            if time.monotonic() - self.checked_at < CHECK_INTERVAL:
+                return
+            signature = store_signature()
+            if signature != self.signature:
+                self.responses = {path: encode(payload) for path, payload in build_payloads().items()}
+                self.signature = signature
+            self.checked_at = time.monotonic()
+
+def encode(payload):
+    """Serializes once, so each request only has to copy bytes."""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha1(body).hexdigest()[:20]
+    # The gzip body is a different representation, so it gets its own tag
+    return {
+        "identity": {"body": body, "etag": f'"{digest}"'},
+        "gzip": {"body": gzip.compress(body), "etag": f'"{digest}-gz"'}
+    }
+
+SNAPSHOT = Snapshot()
+NOT_FOUND = json.dumps({"error": "Not found"}).encode("utf-8")
+
+# --- 3. THE SERVER ---
+def accepts_gzip(header):
+    """Reads Accept-Encoding q-values: "gzip;q=0" is a refusal, "*" covers gzip."""
+    qualities = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    for coding in ("gzip", "x-gzip"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return qualities.get("*", 0) > 0
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().replace("W/", "", 1) == etag for tag in header.split(","))
+
+class PicksHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive for clients polling hard
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        response = SNAPSHOT.get(path)
+
+        if response is None:
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(NOT_FOUND)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(NOT_FOUND)
+            return
+
+        use_gzip = accepts_gzip(self.headers.get("Accept-Encoding"))
+        representation = response["gzip"] if use_gzip else response["identity"]
+
+        if etag_matches(self.headers.get("If-None-Match"), representation["etag"]):
+            self.send_response(304)
+            self.send_common_headers(representation)
+            self.end_headers()
+            return
+
+        body = representation["body"]
+        self.send_response(200)
+        self.send_common_headers(representation)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def send_common_headers(self, representation):
+        self.send_header("ETag", representation["etag"])
+        # Clients keep their copy but check the ETag each time (cheap 304s)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def log_message(self, format, *args):
+        # Per-request logging is the slowest part of a 304 at high request rates
+        pass
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer((HOST, PORT), PicksHandler)
+    server.daemon_threads = True
+    print(f"📡 Serving picks on http://{HOST}:{PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
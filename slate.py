@@ -0,0 +1,216 @@
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+
+# --- SLATE SNAPSHOTS ---
+# Each picks file keeps a compact copy of the slate it was built from, so the
+# second daily run can tell what actually changed and only re-analyze that.
+
+# A spread or total moving this many points since the last run is worth a second look
+LINE_MOVE_THRESHOLD = 1.5
+
+# Set by the pick workflows: push each early pick so the deployed pages see it
+# before the run ends (they only read what's committed)
+PUBLISH_EARLY_PICKS = os.environ.get("PUBLISH_EARLY_PICKS") == "1"
+
+# Pick values that mean the last run never produced a usable pick
+BAD_PICKS = ("Error", "N/A", "No Games Found", "Pending", "See Analysis")
+
+def game_key(game):
+    return f"{game['away_team']} @ {game['home_team']}"
+
+def get_market_point(markets, market_key, team=None):
+    """Returns the line for a market (optionally for one team) or None."""
+    for market in markets:
+        if market.get('key') != market_key: continue
+        for outcome in market.get('outcomes', []):
+            if team is None or outcome.get('name') == team:
+                return outcome.get('point')
+    return None
+
+def build_slate(games):
+    """Shrinks raw Odds API games down to what we need to spot a change."""
+    slate = {}
+    for g in games:
+        bookmakers = g.get('bookmakers') or []
+        markets = bookmakers[0].get('markets', []) if bookmakers else []
+        slate[game_key(g)] = {
+            "home": g['home_team'],
+            "away": g['away_team'],
+            "commence_time": g.get('commence_time'),
+            "spread": get_market_point(markets, 'spreads', g['home_team']),
+            "total": get_market_point(markets, 'totals'),
+        }
+    return slate
+
+def has_started(game, now):
+    """True once a game (raw Odds API game or slate entry) has tipped off."""
+    commence_time = game.get('commence_time')
+    if not commence_time: return False
+    return datetime.fromisoformat(commence_time.replace('Z', '+00:00')) <= now
+
+def diff_slate(old, new, now, threshold=LINE_MOVE_THRESHOLD):
+    """Compares two slates: new games, scratched games and big line moves.
+
+    Games that have tipped off are left out. A finished game drops out of the
+    feed and in-play lines move all the time, neither is a real slate change.
+    """
+    started = {key for key, g in list(old.items()) + list(new.items()) if has_started(g, now)}
+    changes = {
+        "new": [key for key in new if key not in old and key not in started],
+        "scratched": [key for key in old if key not in new and key not in started],
+        "moved": []
+    }
+    for key in new:
+        if key not in old or key in started: continue
+        for field in ("spread", "total"):
+            before, after = old[key].get(field), new[key].get(field)
+            if before is None or after is None:
+                moved = before != after
+            else:
+                moved = abs(after - before) >= threshold
+            if moved:
+                changes["moved"].append(key)
+                break
+    return changes
+
+def has_changes(changes):
+    return any(changes.values())
+
+def describe_changes(changes):
+    parts = []
+    for label in ("new", "scratched", "moved"):
+        if changes[label]:
+            parts.append(f"{len(changes[label])} {label}")
+    return ", ".join(parts) if parts else "no changes"
+
+def format_line_moves(old, new, keys):
+    lines = []
+    for key in keys:
+        moves = [f"{field} {old[key].get(field)} -> {new[key].get(field)}" for field in ("spread", "total")]
+        lines.append(f"{key}: " + ", ".join(moves))
+    return "\n".join(lines)
+
+def pick_game(pick, slate):
+    """Returns the slate key of the game a pick is on, or None.
+
+    Full team names win. A nickname alone ("Wildcats") only counts when exactly
+    one team on the slate has it.
+    """
+    if not pick: return None
+    text = pick.lower()
+    full_matches, nicknames = [], {}
+    for key, g in slate.items():
+        for team in (g['home'], g['away']):
+            if team.lower() in text:
+                full_matches.append((len(team), key))
+            nickname = team.split()[-1].lower()
+            nicknames.setdefault(nickname, []).append(key)
+
+    if full_matches:
+        return max(full_matches)[1]  # Longest name, so "Miami Heat" beats a shorter overlap
+    found = [keys[0] for nickname, keys in nicknames.items() if len(nickname) > 3 and nickname in text and len(keys) == 1]
+    return found[0] if len(found) == 1 else None
+
+def save_picks(path, data):
+    """Writes the picks file in one step so readers never see half a file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+def publish_picks(path, message):
+    """Commits and pushes the picks file right now. Never fails the run."""
+    commands = [
+        ["git", "add", path],
+        ["git", "-c", "user.name=Picks Bot", "-c", "user.email=bot@github.com", "commit", "-m", message],
+        ["git", "pull", "--rebase", "--autostash", "origin", "main"],
+        ["git", "push", "origin", "HEAD:main"]
+    ]
+    try:
+        for command in commands:
+            subprocess.run(command, check=True, capture_output=True, timeout=60)
+    except Exception as e:
+        print(f"Could not publish early picks: {e}")
+
+def progress_saver(path, adjust=None):
+    """on_progress callback: saves every update, publishes each newly found pick."""
+    published = set()
+
+    def save(partial):
+        if adjust:
+            partial = adjust(partial)
+        # Lets the pages tell a live run from one that died mid-stream
+        partial["updated_at"] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        save_picks(path, partial)
+        found = {(slot, partial[slot]) for slot in ("lock", "value") if partial[slot] != "Pending"}
+        if PUBLISH_EARLY_PICKS and not found <= published:
+            publish_picks(path, f"Early picks for {partial['date']}")
+            published.update(found)
+    return save
+
+def load_previous_picks(path, current_date):
+    """Loads today's earlier picks if they are usable as a baseline."""
+    if not os.path.exists(path): return None
+    try:
+        with open(path, "r") as f:
+            previous = json.load(f)
+    except Exception:
+        return None
+
+    if previous.get('date') != current_date or not previous.get('slate'):
+        return None
+    # A run that died mid-stream never finished its picks
+    if previous.get('status') == 'streaming':
+        return None
+    if previous.get('lock') in BAD_PICKS or previous.get('value') in BAD_PICKS:
+        return None
+    return previous
+
+def needs_full_run(previous, changes):
+    """A scratched pick can only be replaced by looking at the whole slate."""
+    for slot in ("lock", "value"):
+        if pick_game(previous.get(slot), previous['slate']) in changes['scratched']:
+            return True
+    return False
+
+def started_picks(previous, now):
+    """Slots whose game has tipped off. Those picks are in play and never replaced."""
+    slots = []
+    for slot in ("lock", "value"):
+        key = pick_game(previous.get(slot), previous['slate'])
+        if key and has_started(previous['slate'][key], now):
+            slots.append(slot)
+    return slots
+
+def keep_started_picks(previous, picks, now):
+    """Puts back any earlier pick whose game has already tipped off."""
+    for slot in started_picks(previous, now):
+        picks[slot] = previous[slot]
+        if "pick_notes" in picks:
+            picks["pick_notes"][slot] = "Kept: game has already tipped off."
+    return picks
+
+def keep_previous_picks(previous, reason, now):
+    """Returns the earlier picks unchanged when this run has nothing better to offer."""
+    started = started_picks(previous, now)
+    notes = {slot: "Kept: game has already tipped off." if slot in started else f"Kept: {reason}" for slot in ("lock", "value")}
+    return dict(previous, pick_notes=notes)
+
+def explain_picks(previous, lock, value, changes, reanalyzed=True, started=()):
+    """Records why each pick survived (or didn't) the run."""
+    summary = describe_changes(changes)
+    notes = {}
+    for slot, pick in (("lock", lock), ("value", value)):
+        if slot in started:
+            notes[slot] = "Kept: game has already tipped off."
+        elif not has_changes(changes):
+            notes[slot] = "Kept: no slate changes since the last run."
+        elif not reanalyzed:
+            notes[slot] = f"Kept: no re-analysis needed ({summary}), nothing new to weigh against this pick."
+        elif pick == previous.get(slot):
+            notes[slot] = f"Kept: re-analyzed changed games ({summary}), earlier pick still holds."
+        else:
+            notes[slot] = f"Changed from '{previous.get(slot)}' after re-analyzing changed games ({summary})."
+    return notes
@@ -1,7 +1,7 @@
 import os
 import json
-import requests
 import re
+from odds_scheduler import fetch_scores
 
 # --- CONFIGURATION ---
 ODDS_API_KEY = os.environ.get("ODDS_API_KEY")
@@ -105,10 +105,8 @@ if __name__ == "__main__":
     print(f"Checking NCAAB results for: {picks_data['date']}")
     print("Fetching scores from API...")
     
-    # Note: Confirmed endpoint is 'basketball_ncaab'
-    url = f"https://api.the-odds-api.com/v4/sports/basketball_ncaab/scores/?daysFrom=3&apiKey={ODDS_API_KEY}"
-    response = requests.get(url)
-    scores_data = response.json()
+    # Shared with any other job that already fetched scores after these games went final
+    scores_data = fetch_scores("ncaab")
 
     # Update Lock
     id_l, line_l, type_l = parse_pick_text(picks_data["lock"])